@@ -203,6 +203,15 @@ class AutoTokenizer(TokenizerSpec):
         ids = self.tokens_to_ids(tokens)
         return ids
 
+    def text_to_ids_batch(self, texts):
+        """Tokenize a list of texts with a single call into the underlying tokenizer.
+
+        Fast (Rust-backed) tokenizers amortize the per-call overhead across the whole batch.
+        """
+        if getattr(self.tokenizer, 'is_fast', False):
+            return self.tokenizer(texts, add_special_tokens=False)['input_ids']
+        return super().text_to_ids_batch(texts)
+
     def ids_to_text(self, ids):
         tokens = self.ids_to_tokens(ids)
         tokens_clean = [t for t in tokens if t not in self.tokenizer.all_special_tokens]
@@ -43,6 +43,10 @@ class TokenizerSpec(ABC):
     def text_to_ids(self, text):
         pass
 
+    def text_to_ids_batch(self, texts: List[str]) -> List[List[int]]:
+        """Tokenize a list of texts. Tokenizers that support batched encoding should override this method."""
+        return [self.text_to_ids(text) for text in texts]
+
     @abstractmethod
     def ids_to_text(self, ids):
         pass
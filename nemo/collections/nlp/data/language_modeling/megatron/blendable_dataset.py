@@ -76,6 +76,19 @@ class BlendableDataset(torch.utils.data.Dataset):
         sample_idx = self.dataset_sample_index[idx]
         return self.datasets[dataset_idx][sample_idx]
 
+    def sample_lengths(self):
+        """Per-sample lengths of the blended samples, gathered from the underlying datasets.
+
+        Intended for length-aware batch samplers; requires every blended dataset to
+        provide its own ``sample_lengths()``.
+        """
+        lengths = np.zeros(self.size, dtype=np.int64)
+        for dataset_idx, dataset in enumerate(self.datasets):
+            mask = self.dataset_index == dataset_idx
+            dataset_lengths = np.asarray(dataset.sample_lengths(), dtype=np.int64)
+            lengths[mask] = dataset_lengths[self.dataset_sample_index[mask]]
+        return lengths
+
     def create_data_mmap(self):
         for dataset in self.datasets:
             dataset.create_data_mmap()
@@ -12,8 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
-
+import numpy as np
 import torch
 
 from nemo.collections.common.tokenizers.sentencepiece_tokenizer import SentencePieceTokenizer
@@ -66,11 +65,16 @@ def _mask_targets(
     """
     cur_idx = header_len
     tgt_len = target.shape[0]
+    # note, sentence piece will add extra empty token in front. has to compute the diff
+    # the skip length only depends on the speaker name, so compute it once per speaker
+    # instead of re-tokenizing the same strings for every turn
+    id1 = tokenizer.text_to_ids("<extra_id_1>")
+    name_lens = {
+        speaker: len(tokenizer.text_to_ids("<extra_id_1>" + TURN_TOKEN + speaker + END_NAME_SIGNAL)) - len(id1)
+        for speaker in set(speakers)
+    }
     for i, (tokenized_len, speaker, s_id) in enumerate(zip(tokenized_lens, speakers, s_ids)):
-        # note, sentence piece will add extra empty token in front. has to compute the diff
-        id1 = tokenizer.text_to_ids("<extra_id_1>")
-        id2 = tokenizer.text_to_ids("<extra_id_1>" + TURN_TOKEN + speaker + END_NAME_SIGNAL)
-        skip_name_len = len(id2) - len(id1)
+        skip_name_len = name_lens[speaker]
         if extra_id_2_token_id is None:
             raise ValueError("extra_id_2 is not in the vocabulary")
         if (s_id == extra_id_2_token_id).any().item():
@@ -169,7 +173,7 @@ def preprocess(source: dict, tokenizer: TokenizerSpec, extra_id_2_token_id: int,
     1. Add signal '### ' at the beginning each sentence, with end signal '\n';
     2. Concatenate conversations together;
     3. Tokenize the concatenated conversation;
-    4. Make a deepcopy as the target. Mask human words with IGNORE_INDEX.
+    4. Make a copy as the target. Mask human words with IGNORE_INDEX.
     """
     data_type = None
     if 'type' in source:
@@ -183,30 +187,29 @@ def preprocess(source: dict, tokenizer: TokenizerSpec, extra_id_2_token_id: int,
     mask_role = source.get('mask', 'User')
     header = f"{SYSTEM_TOKEN}{conversation}"
     conversation = _add_speaker_and_signal(header, source['conversations'], mask_role, data_type)
-    # tokenize conversations
-    input_ids = tokenizer.text_to_ids(conversation)
-    target = copy.deepcopy(input_ids)
-    header_len = len(tokenizer.text_to_ids(header))
+    # tokenize the full conversation, the header and every turn in one batched call
+    tokenized = tokenizer.text_to_ids_batch([conversation, header] + [s["value"] for s in source['conversations']])
+    input_ids = tokenized[0]
+    header_len = len(tokenized[1])
 
     ids = []
     tokenized_lens = []
-    for s in source['conversations']:
+    for tokenized_sentence in tokenized[2:]:
         if isinstance(tokenizer, SentencePieceTokenizer):
-            tokenized_sentence = tokenizer.text_to_ids(s["value"])
             ids.append(torch.tensor(tokenized_sentence)[1:])
             # remove one token as it adds an empty token in front
             tokenized_lens.append(len(tokenized_sentence) - 1)
         else:
-            tokenized_sentence = tokenizer.text_to_ids(s["value"])
             ids.append(torch.tensor(tokenized_sentence))
             # remove one token as it adds an empty token in front
             tokenized_lens.append(len(tokenized_sentence))
     speakers = [sentence["from"] for sentence in source['conversations']]
     assert mask_role in speakers, "mask role not in the conversation"
-    target = torch.LongTensor(target)
+    # np.asarray already copies the id list, so the target needs no separate deepcopy
+    target = torch.from_numpy(np.asarray(input_ids, dtype=np.int64))
     # not going to train on the header
     target[:header_len] = IGNORE_INDEX
-    input_ids = torch.LongTensor(input_ids)
+    input_ids = torch.from_numpy(np.asarray(input_ids, dtype=np.int64))
     _mask_targets(
         target,
         tokenized_lens,
@@ -257,6 +260,28 @@ class GPTSFTChatDataset(GPTSFTDataset):
         ids_2 = self.tokenizer.text_to_ids('<extra_id_1>')
         self.new_line_token_id = ids_1[len(ids_2) :][0]
 
+    def _maybe_load_tokenized_index(self):
+        # chat examples carry per-turn loss masks that the flat tokenized index
+        # of the parent class does not encode, so never serve from one here
+        pass
+
+    def sample_lengths(self):
+        """Character lengths of the system prompt plus all conversation turns of every sample.
+
+        Like the parent implementation, a cheap tokenizer-free proxy of per-sample token
+        lengths for length-aware batching; chat rows have no context/label keys to render.
+        """
+        lengths = []
+        for idx in range(len(self)):
+            example = self._load_example(idx)
+            lengths.append(len(example['system']) + sum(len(s['value']) for s in example['conversations']))
+        return lengths
+
+    def _process_batch(self, examples):
+        # conversations are tokenized turn by turn in preprocess, so there is no
+        # batched render/tokenize split to share with the parent class
+        return [self._process_example(example) for example in examples]
+
     def _process_example(self, example):
         """
         Create an example by concatenating text and answer.
@@ -272,11 +297,13 @@ class GPTSFTChatDataset(GPTSFTDataset):
         return result
 
     def collate_fn(self, batch):
-        input_ids = [item['input_ids'][:-1].tolist() for item in batch]
-        labels = [item['input_ids'][1:].tolist() for item in batch]
-        contexts = [item['context_ids'].tolist() for item in batch]
-        answers = [item['answer_ids'].tolist() for item in batch]
-        loss_mask = [item['mask'][1:].tolist() for item in batch]
+        # keep the per-sample tensors as-is; _collate_item assigns them into the padded
+        # numpy buffers directly, so round-tripping through Python lists is pure overhead
+        input_ids = [item['input_ids'][:-1] for item in batch]
+        labels = [item['input_ids'][1:] for item in batch]
+        contexts = [item['context_ids'] for item in batch]
+        answers = [item['answer_ids'] for item in batch]
+        loss_mask = [item['mask'][1:] for item in batch]
         metadata = [item['metadata'] for item in batch]
 
         max_length = max(max([len(x) for x in input_ids]), max([len(x) for x in contexts]) + self.tokens_to_generate)
@@ -294,23 +321,21 @@ class GPTSFTChatDataset(GPTSFTDataset):
             max_length = min(self.max_seq_length, self._ceil_to_nearest(max_length, 8))
         assert max_length <= self.max_seq_length
 
-        attention_mask = [self._create_attention_mask(max_length) for _ in batch]
-        attention_mask = torch.stack(attention_mask)
-        position_ids = [list(range(max_length)) for _ in batch]
-        position_ids = torch.LongTensor(position_ids)
-        input_ids = torch.LongTensor(
+        position_ids = self._position_ids[:max_length].unsqueeze(0).expand(len(batch), -1)
+        input_ids = torch.from_numpy(
             self._collate_item(input_ids, max_length=max_length, pad_id=self.tokenizer.eos_id)
         )
-        labels = torch.LongTensor(self._collate_item(labels, max_length=max_length, pad_id=self.tokenizer.eos_id))
-        loss_mask = torch.LongTensor(self._collate_item(loss_mask, max_length=max_length, pad_id=0))
-        context_lengths = torch.LongTensor([len(x) for x in contexts])
-        contexts = torch.LongTensor(self._collate_item(contexts, max_length=max_length, pad_id=self.tokenizer.eos_id))
-        answers = torch.LongTensor(self._collate_item(answers, max_length=max_length, pad_id=self.tokenizer.eos_id))
+        labels = torch.from_numpy(self._collate_item(labels, max_length=max_length, pad_id=self.tokenizer.eos_id))
+        loss_mask = torch.from_numpy(self._collate_item(loss_mask, max_length=max_length, pad_id=0))
+        context_lengths = torch.from_numpy(
+            np.fromiter((len(x) for x in contexts), dtype=np.int64, count=len(contexts))
+        )
+        contexts = torch.from_numpy(self._collate_item(contexts, max_length=max_length, pad_id=self.tokenizer.eos_id))
+        answers = torch.from_numpy(self._collate_item(answers, max_length=max_length, pad_id=self.tokenizer.eos_id))
 
         processed_batch = {
             'tokens': input_ids,
             'labels': labels,
-            'attention_mask': attention_mask,
             'loss_mask': loss_mask,
             'position_ids': position_ids,
             'contexts': contexts,
@@ -319,4 +344,11 @@ class GPTSFTChatDataset(GPTSFTDataset):
             'metadata': metadata,
         }
 
+        if self.emit_attention_mask:
+            # The causal mask is the same for every sample, so build it once and
+            # expand (a view, no copy) across the batch instead of stacking B copies.
+            processed_batch['attention_mask'] = (
+                self._create_attention_mask(max_length).unsqueeze(0).expand(len(batch), -1, -1, -1)
+            )
+
         return processed_batch
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional
+import json
+import os
+from typing import List, Optional
 
 import numpy as np
 import torch
@@ -20,7 +22,7 @@ from datasets import load_dataset
 
 from nemo.collections.common.tokenizers.tokenizer_spec import TokenizerSpec
 from nemo.collections.nlp.data.language_modeling.megatron.dataset_utils import get_samples_mapping
-from nemo.collections.nlp.data.language_modeling.text_memmap_dataset import JSONLMemMapDataset
+from nemo.collections.nlp.data.language_modeling.text_memmap_dataset import ArrowMemMapDataset, JSONLMemMapDataset
 from nemo.core.classes import Dataset
 from nemo.utils import logging
 
@@ -52,6 +54,11 @@ class GPTSFTDataset(Dataset):
         tokens_to_generate: int = 0,
         memmap_workers: Optional[int] = None,
         hf_dataset: bool = False,
+        metadata_keys: Optional[List[str]] = None,
+        pack_sequences: bool = False,
+        cache_processed: bool = True,
+        use_tokenized_index: bool = False,
+        emit_attention_mask: bool = True,
     ):
         """
         file_path: Path to a JSONL GPT supervised fine-tuning dataset. Data is formatted as multiple JSON lines with each line formatted as follows. {'input': 'John von Neumann\nVon Neumann made fundamental contributions .... Q: What did the math of artificial viscosity do?', 'output': 'smoothed the shock transition without sacrificing basic physics'}
@@ -74,6 +81,11 @@ class GPTSFTDataset(Dataset):
         index_mapping_dir: Directory to save the index mapping to. If None, will write to the same folder as the dataset.
         prompt_template: Prompt template to inject via an fstring. Formatted like Q: {context_key}\n\nA: {label_key}
         hf_dataset: Whether to load the json file with the HuggingFace dataset. otherwise, will load the jsonl file with the JSONLMemMapDataset.
+        metadata_keys: Keys to keep as pass-through metadata in the processed examples. If None, all keys other than context_key and label_key are kept.
+        pack_sequences: (training only) Pack multiple examples per max_seq_length window in collate_fn instead of padding. Position ids restart at every example boundary and the attention mask is block-diagonal causal, so the loss matches unpacked batches while spending almost no tokens on padding.
+        cache_processed: Cache processed (tokenized) examples in memory when max_num_samples oversamples the dataset, so revisits of the same sample skip tokenization. Has no effect without oversampling.
+        use_tokenized_index: If True and a tokenized binary index built by build_tokenized_index() exists next to file_path, serve examples from it as mmap'ed id slices instead of re-tokenizing text. The index is rejected if the dataset file changed or the tokenizer/template settings differ from those it was built with. Opt-in and training only; pass-through metadata is not preserved in the index, so keep it off for validation/test datasets that rely on metadata.
+        emit_attention_mask: Whether collate_fn includes the [B, 1, L, L] attention mask in the batch. Set False for models that build their own causal mask (or use flash attention) to skip the L^2 allocation and transfer per batch.
         """
         self.tokenizer = tokenizer
         self.file_path = file_path
@@ -95,15 +107,47 @@ class GPTSFTDataset(Dataset):
         self.prompt_template = prompt_template
         self.virtual_tokens = virtual_tokens
         self.tokens_to_generate = tokens_to_generate
+        self.metadata_keys = metadata_keys
+        self.pack_sequences = pack_sequences
+        self.emit_attention_mask = emit_attention_mask
+        self._excluded_metadata_keys = frozenset((self.context_key, self.label_key))
         if self.prompt_template is not None:
             # When providing things like newlines in the prompt template via the CLI, they are escaped. This line unescapes them.
             self.prompt_template = self.prompt_template.encode('utf-8').decode('unicode_escape')
+            # The placeholder strings and the label-free variant of the template are static,
+            # so build them once here instead of re-deriving them for every example.
+            self._context_placeholder = f'{{{self.context_key}}}'
+            self._label_placeholder = f'{{{self.label_key}}}'
+            # Validate the template once here; it does not depend on the sample.
+            assert self._context_placeholder in self.prompt_template
+            assert self._label_placeholder in self.prompt_template
+            # Make sure that '{output}' always occurs at the end of the prompt template string
+            assert self.prompt_template.index(self._label_placeholder) == len(self.prompt_template) - len(
+                self._label_placeholder
+            )
+            self._context_template = self.prompt_template.replace(self._label_placeholder, '')
+            # Pre-split the label-free template around the context placeholder, so each
+            # render is a single C-level str.join instead of scanning the template again.
+            self._context_template_parts = self._context_template.split(self._context_placeholder)
         assert self.truncation_field in ["answer", "context"]
+        # resolved once here so _assemble_example picks the truncation side without
+        # re-comparing the field name for every sample
+        self._truncate_answer = self.truncation_field == "answer"
 
         if hf_dataset:
             self.indexed_dataset = load_dataset(
                 'json', data_files=file_path, cache_dir=index_mapping_dir, num_proc=memmap_workers, split='train'
             )
+            if self.metadata_keys is not None:
+                # Only materialize the columns that _process_example actually reads;
+                # unused columns would otherwise be converted to Python objects per row.
+                self.indexed_dataset = self.indexed_dataset.select_columns(
+                    [self.context_key, self.label_key] + list(self.metadata_keys)
+                )
+        elif file_path.endswith('.arrow') or file_path.endswith('.feather'):
+            # Arrow-backed store: per-row access is an offset lookup into the
+            # mmap'ed table, with no JSON parsing in __getitem__.
+            self.indexed_dataset = ArrowMemMapDataset(dataset_paths=[file_path])
         else:
             self.indexed_dataset = JSONLMemMapDataset(
                 dataset_paths=[file_path],
@@ -113,11 +157,43 @@ class GPTSFTDataset(Dataset):
                 workers=memmap_workers,
             )
 
+        # The add_bos/add_sep/add_eos/virtual_tokens flags are fixed for the life of the
+        # dataset; resolve them to affix lists once so _process_example assembles each
+        # sample with plain concatenations instead of re-branching per sample.
+        self._pre_pad = [self.tokenizer.eos_id] * self.virtual_tokens
+        self._bos_ids = [self.tokenizer.bos_id] if self.add_bos else []
+        self._sep_ids = [self.sep_id] if self.add_sep else []
+        # Only training need to consider eos token
+        self._eos_ids = [self.tokenizer.eos_id] if self.add_eos and self.tokens_to_generate == 0 else []
+        self._num_special_tokens = len(self._bos_ids) + len(self._sep_ids) + len(self._eos_ids)
+
+        # Position ids are deterministic; precompute once and slice per batch in collate_fn
+        self._position_ids = torch.arange(self.max_seq_length, dtype=torch.long)
+
         # Will be None after this call if `max_num_samples` is None
         self._build_samples_mapping()
 
+        # Processed examples are deterministic per underlying row, so when oversampling
+        # revisits rows across epochs we can keep the ids around instead of re-tokenizing.
+        # The cache is keyed by the resolved row index and thus bounded by the dataset size.
+        if cache_processed and self.max_num_samples is not None and self.max_num_samples > len(self.indexed_dataset):
+            self._processed_cache = {}
+            self._processed_cache_maxsize = min(len(self.indexed_dataset), 1_000_000)
+        else:
+            self._processed_cache = None
+
+        # Tokenized binary index (see build_tokenized_index). When present, __getitem__
+        # becomes an mmap slice and the tokenizer is never called at training time.
+        self._tokenized_ids = None
+        self._tokenized_idx = None
+        if use_tokenized_index:
+            self._maybe_load_tokenized_index()
+
     def _build_samples_mapping(self):
         if self.max_num_samples is not None:
+            # get_samples_mapping builds the mapping once, caches it as a .npy file next to
+            # the dataset (or in index_mapping_dir) and reloads it with mmap_mode='r', so
+            # warm starts and multiple ranks/workers share the cached pages on disk.
             self.samples_mapping = get_samples_mapping(
                 indexed_dataset=self.indexed_dataset,
                 data_prefix=self.file_path,
@@ -130,8 +206,12 @@ class GPTSFTDataset(Dataset):
                 binary_head=False,
                 index_mapping_dir=self.index_mapping_dir,
             )
+            # Keep just the dataset indices as a typed int64 array; __getitem__ then
+            # avoids destructuring a numpy row and the per-sample uint32 .item() call.
+            self._sample_idx_map = np.asarray(self.samples_mapping[:, 0], dtype=np.int64)
         else:
             self.samples_mapping = None
+            self._sample_idx_map = None
 
     def __len__(self):
         if self.max_num_samples is None:
@@ -139,26 +219,166 @@ class GPTSFTDataset(Dataset):
         else:
             return len(self.samples_mapping)
 
-    def __getitem__(self, idx):
-        if isinstance(idx, np.int64):
-            idx = idx.item()
+    def _tokenized_index_paths(self):
+        return (
+            self.file_path + '.tokenized.ids.bin',
+            self.file_path + '.tokenized.idx.npy',
+            self.file_path + '.tokenized.meta.json',
+        )
+
+    def _tokenized_index_fingerprint(self):
+        """Settings baked into the id stream; a mismatch means the index is invalid."""
+        return {
+            'tokenizer': type(self.tokenizer).__name__,
+            'vocab_size': getattr(self.tokenizer, 'vocab_size', None),
+            'prompt_template': self.prompt_template,
+            'separate_prompt_and_response_with_newline': self.separate_prompt_and_response_with_newline,
+            'context_key': self.context_key,
+            'label_key': self.label_key,
+            'truncation_field': self.truncation_field,
+            'add_bos': self.add_bos,
+            'add_eos': self.add_eos,
+            'add_sep': self.add_sep,
+            'sep_id': self.sep_id,
+            'virtual_tokens': self.virtual_tokens,
+            'max_seq_length': self.max_seq_length,
+            'tokens_to_generate': self.tokens_to_generate,
+        }
 
-        if self.samples_mapping is not None:
-            assert idx < len(self.samples_mapping)
-            idx, _, _ = self.samples_mapping[idx]
-            if isinstance(idx, np.uint32):
-                idx = idx.item()
+    def build_tokenized_index(self, batch_size: int = 512):
+        """Tokenize the whole dataset once and write it next to file_path as a binary index.
+
+        Writes a flat int32 id stream (`<file_path>.tokenized.ids.bin`) and an int64
+        (offset, length, answer_start_idx) table (`<file_path>.tokenized.idx.npy`).
+        Later runs constructed with use_tokenized_index=True load both with mmap and
+        skip text loading and tokenization entirely.
+        """
+        ids_path, idx_path, meta_path = self._tokenized_index_paths()
+        entries = []
+        offset = 0
+        with open(ids_path, 'wb') as ids_file:
+            for start in range(0, len(self.indexed_dataset), batch_size):
+                examples = [self.indexed_dataset[i] for i in range(start, min(start + batch_size, len(self.indexed_dataset)))]
+                for processed in self._process_batch(examples):
+                    ids = np.asarray(processed['input_ids'], dtype=np.int32)
+                    ids_file.write(ids.tobytes())
+                    entries.append((offset, len(ids), processed['answer_start_idx']))
+                    offset += len(ids)
+        np.save(idx_path, np.asarray(entries, dtype=np.int64))
+        # record the dataset mtime and the settings baked into the ids, so stale or
+        # mismatched indices are refused at load time instead of silently used
+        with open(meta_path, 'w') as meta_file:
+            json.dump(
+                {'dataset_mtime': os.path.getmtime(self.file_path), 'fingerprint': self._tokenized_index_fingerprint()},
+                meta_file,
+            )
+        logging.info(f'Wrote tokenized index for {self.file_path} ({offset} tokens, {len(entries)} samples)')
+
+    def _maybe_load_tokenized_index(self):
+        ids_path, idx_path, meta_path = self._tokenized_index_paths()
+        if not (os.path.exists(ids_path) and os.path.exists(idx_path) and os.path.exists(meta_path)):
+            return
+        with open(meta_path) as meta_file:
+            meta = json.load(meta_file)
+        if meta.get('dataset_mtime') != os.path.getmtime(self.file_path):
+            logging.warning(
+                f'Tokenized index for {self.file_path} is older than the dataset file; ignoring it. '
+                f'Rerun build_tokenized_index() to refresh it.'
+            )
+            return
+        if meta.get('fingerprint') != self._tokenized_index_fingerprint():
+            logging.warning(
+                f'Tokenized index for {self.file_path} was built with different tokenizer/template settings; '
+                f'ignoring it. Rerun build_tokenized_index() to refresh it.'
+            )
+            return
+        self._tokenized_idx = np.load(idx_path, mmap_mode='r')
+        self._tokenized_ids = np.memmap(ids_path, dtype=np.int32, mode='r')
+        logging.info(f'Serving {self.file_path} from tokenized index {ids_path}; skipping tokenization.')
+
+    def _tokenized_example(self, idx):
+        """Rebuild a processed example from mmap'ed id slices, without the tokenizer."""
+        offset, length, answer_start_idx = (int(x) for x in self._tokenized_idx[idx])
+        input_ids = np.asarray(self._tokenized_ids[offset : offset + length], dtype=np.int64)
+        return {
+            'input_ids': input_ids,
+            'answer_start_idx': answer_start_idx,
+            'context_ids': input_ids[:answer_start_idx],
+            'context_length': answer_start_idx,
+            'answer_ids': input_ids[answer_start_idx : length - len(self._eos_ids)],
+            'metadata': {},
+        }
+
+    def __getitem__(self, idx):
+        if self._tokenized_idx is not None:
+            return self._tokenized_example(self._resolve_idx(idx))
+
+        if self._processed_cache is None:
+            return self._process_example(self._load_example(idx))
+
+        idx = self._resolve_idx(idx)
+        processed = self._processed_cache.get(idx)
+        if processed is None:
+            processed = self._process_example(self._fetch_example(idx))
+            if len(self._processed_cache) < self._processed_cache_maxsize:
+                self._processed_cache[idx] = processed
+        return processed
+
+    def __getitems__(self, indices):
+        """Batched fetch used by the DataLoader, tokenizing a whole batch in one call."""
+        if self._tokenized_idx is not None:
+            return [self._tokenized_example(self._resolve_idx(idx)) for idx in indices]
+
+        if self._processed_cache is None:
+            return self._process_batch([self._load_example(idx) for idx in indices])
+
+        resolved = [self._resolve_idx(idx) for idx in indices]
+        missing = [idx for idx in dict.fromkeys(resolved) if idx not in self._processed_cache]
+        fresh = dict(zip(missing, self._process_batch([self._fetch_example(idx) for idx in missing]))) if missing else {}
+        for idx, processed in fresh.items():
+            if len(self._processed_cache) < self._processed_cache_maxsize:
+                self._processed_cache[idx] = processed
+        return [self._processed_cache[idx] if idx in self._processed_cache else fresh[idx] for idx in resolved]
+
+    def _resolve_idx(self, idx):
+        """Map a sampler index to the underlying row index of the indexed dataset."""
+        # int() normalizes both Python ints and the numpy scalars some samplers yield
+        idx = int(idx)
+
+        if self._sample_idx_map is not None:
+            assert idx < len(self._sample_idx_map)
+            idx = int(self._sample_idx_map[idx])
 
         assert idx < len(self.indexed_dataset)
         # idx may < 0 because we pad_samples_to_global_batch_size, e.g. id = -1
         if idx < 0:
             idx = len(self) + idx
+        return idx
+
+    def _load_example(self, idx):
+        return self._fetch_example(self._resolve_idx(idx))
+
+    def _fetch_example(self, idx):
         try:
             example = self.indexed_dataset[idx]
         except Exception as e:
             logging.error(f"Error while loading example {idx} from dataset {self.file_path}")
             raise e
-        return self._process_example(example)
+        return example
+
+    def _process_batch(self, examples):
+        """Process a list of raw examples with a single batched tokenizer call.
+
+        All text/context string pairs are flattened into one text_to_ids_batch call and
+        re-split per example, so fast tokenizers amortize the per-call overhead across
+        the whole batch instead of paying it twice per sample.
+        """
+        rendered = [self._render_example(example) for example in examples]
+        flat_ids = self.tokenizer.text_to_ids_batch([string for pair in rendered for string in pair])
+        return [
+            self._assemble_example(example, flat_ids[2 * i], flat_ids[2 * i + 1])
+            for i, example in enumerate(examples)
+        ]
 
     def _process_example(self, example):
         """
@@ -166,123 +386,109 @@ class GPTSFTDataset(Dataset):
         Truncation is carried out when needed, but it is performed only on the prompt side.
         BOS, EOS, and SEP, are added if specified.
         """
+        text, context = self._render_example(example)
+        # tokenize the full text and the context in one batched call to amortize tokenizer overhead
+        text_ids, context_only_ids = self.tokenizer.text_to_ids_batch([text, context])
+        return self._assemble_example(example, text_ids, context_only_ids)
+
+    def _render_example(self, example):
+        """Render the full text and the context prefix strings for one raw example."""
         context = example[self.context_key]
         output = example[self.label_key]
 
         if self.prompt_template is not None:
-            assert f'{{{self.context_key}}}' in self.prompt_template
-            assert f'{{{self.label_key}}}' in self.prompt_template
-            # Make sure that '{output}' always occurs at the end of the prompt template string
-            assert self.prompt_template.index(f'{{{self.label_key}}}') == len(self.prompt_template) - len(
-                f'{{{self.label_key}}}'
-            )
-            # Get the context by replacing only the input
-            original_context = context
-            context = (
-                self.prompt_template.replace(f'{{{self.context_key}}}', context)
-                .replace(f'{{{self.label_key}}}', '')
-                .strip(' ')
-            )
-            # Replace the input and output placeholders with the actual input and output
-            text = self.prompt_template.replace(f'{{{self.context_key}}}', original_context).replace(
-                f'{{{self.label_key}}}', output
-            )
+            # Fill the input into the pre-split label-free template; the label
+            # placeholder sits at the template's end, so the full text is the
+            # rendered context followed by the output.
+            rendered_context = context.join(self._context_template_parts)
+            context = rendered_context.strip(' ')
+            text = rendered_context + output
 
         elif self.separate_prompt_and_response_with_newline:
             text = context + '\n' + output
         else:
             text = context + ' ' + output
 
-        if self.virtual_tokens:
-            # (@adithyare) we are going to insert "pad/eos" tokens in the beginning of the text and context
-            # these pad/eos tokens are placeholders for virtual tokens
-            pre_pad = [self.tokenizer.eos_id] * self.virtual_tokens
-        else:
-            pre_pad = []
-        tokenized_text = pre_pad + self.tokenizer.text_to_ids(text)
-        context_ids = pre_pad + self.tokenizer.text_to_ids(context)
+        return text, context
+
+    def _assemble_example(self, example, text_ids, context_only_ids):
+        """Build the processed example dict from the tokenized text and context."""
+        # (@adithyare) self._pre_pad inserts "pad/eos" tokens in the beginning of the text and context
+        # these pad/eos tokens are placeholders for virtual tokens
+        tokenized_text = self._pre_pad + text_ids
+        context_ids = self._pre_pad + context_only_ids
         answer_ids = tokenized_text[len(context_ids) :]
 
         # for the long context cases, collate_fn includes self.tokens_to_generate for padding
-        total_ids = len(context_ids) + max(len(answer_ids), self.tokens_to_generate)
-        if self.add_bos:
-            total_ids += 1
-        if self.add_sep:
-            total_ids += 1
-        # Only training need to consider eos token
-        if self.add_eos and self.tokens_to_generate == 0:
-            total_ids += 1
+        total_ids = len(context_ids) + max(len(answer_ids), self.tokens_to_generate) + self._num_special_tokens
 
         # If the total number of token is greater than the max, we will try to truncate the answer
         if total_ids > self.max_seq_length:
             truncation_length = total_ids - self.max_seq_length
-            if self.truncation_field == "answer":
-                answer_ids = answer_ids[: -min(truncation_length, len(answer_ids))]
-            elif self.truncation_field == "context":
-                context_ids = context_ids[: -min(truncation_length, len(context_ids))]
-
-        input_ids = context_ids
-        answer_start_idx = len(input_ids)
-
-        # Adds bos token in the start
-        if self.add_bos:
-            context_ids = [self.tokenizer.bos_id] + context_ids
-            input_ids = [self.tokenizer.bos_id] + input_ids
-            answer_start_idx += 1
-
-        # Adds sep token between text/prompt and answer
-        if self.add_sep:
-            context_ids = context_ids + [self.sep_id]
-            input_ids = input_ids + [self.sep_id]
-            answer_start_idx += 1
+            if self._truncate_answer:
+                answer_ids = answer_ids[: max(0, len(answer_ids) - truncation_length)]
+            else:
+                context_ids = context_ids[: max(0, len(context_ids) - truncation_length)]
 
-        input_ids = input_ids + answer_ids
-
-        # Only training need to consider eos token
-        if self.add_eos and self.tokens_to_generate == 0:
-            input_ids = input_ids + [self.tokenizer.eos_id]
+        # Add the precomputed BOS prefix and SEP suffix (between text/prompt and answer)
+        # around the context, and the EOS suffix behind the answer (training only)
+        context_ids = self._bos_ids + context_ids + self._sep_ids
+        answer_start_idx = len(context_ids)
+        input_ids = context_ids + answer_ids + self._eos_ids
 
         if len(input_ids) > self.max_seq_length:
             logging.warning(f'Input ids length {len(input_ids)} exceed max sequence length {self.max_seq_length}')
             input_ids = input_ids[: self.max_seq_length]
 
         # store metadata in dataset, in case user may have keys required in the prediction json files
-        metadata = {k: v for k, v in example.items() if k not in [self.context_key, self.label_key]}
+        if self.metadata_keys is not None:
+            metadata = {k: example[k] for k in self.metadata_keys}
+        else:
+            metadata = {k: v for k, v in example.items() if k not in self._excluded_metadata_keys}
 
+        # Ship the id sequences as int32 ndarrays: when DataLoader workers are used they
+        # pickle as one contiguous buffer instead of one PyObject per token, and the
+        # int64 collate buffers upcast them on assignment.
         processed_example = {
-            'input_ids': input_ids,
+            'input_ids': np.asarray(input_ids, dtype=np.int32),
             'answer_start_idx': answer_start_idx,
-            'context_ids': context_ids,
+            'context_ids': np.asarray(context_ids, dtype=np.int32),
             'context_length': len(context_ids),
-            'answer_ids': answer_ids,
+            'answer_ids': np.asarray(answer_ids, dtype=np.int32),
             'metadata': metadata,
         }
 
         return processed_example
 
-    def _maybe_cast_to_list(self, x):
-        if isinstance(x, np.ndarray):
-            return [item.tolist() for item in x]
-        return x
+    def sample_lengths(self):
+        """Character lengths of the rendered text of every sample.
+
+        A cheap, tokenizer-free proxy of per-sample token lengths, intended for
+        length-aware batching (see MegatronLengthBucketBatchSampler).
+        """
+        return [len(self._render_example(self._load_example(idx))[0]) for idx in range(len(self))]
 
     def _ceil_to_nearest(self, n, m):
         return (n + m - 1) // m * m
 
-    def _collate_item(self, item, max_length, pad_id):
-        item = self._maybe_cast_to_list(item)
-        # max_length = max([len(x) for x in item]) if item else 0
-        # here [0] should be tokenizer.pad_id
-        item = [x + [pad_id] * (max_length - len(x)) for x in item]
-        return item
+    def _collate_item(self, item, max_length, pad_id, out=None):
+        # Pad all rows into one preallocated buffer; row assignment handles both
+        # Python lists and numpy arrays without materializing intermediate lists.
+        if out is None:
+            out = np.empty((len(item), max_length), dtype=np.int64)
+        out.fill(pad_id)
+        for i, x in enumerate(item):
+            out[i, : len(x)] = x
+        return out
 
     def _build_loss_mask(self, processed_example):
         """ Pad input_ids in batch to max batch length while building loss mask """
-        input_ids = processed_example['input_ids']
-        answer_start_idx = processed_example['answer_start_idx']
+        seq_length = len(processed_example['input_ids'])
         if self.answer_only_loss:
-            loss_mask = [float(idx >= answer_start_idx) for idx in range(len(input_ids))]
+            loss_mask = np.zeros(seq_length, dtype=np.int64)
+            loss_mask[processed_example['answer_start_idx'] :] = 1
         else:
-            loss_mask = [1.0] * len(input_ids)
+            loss_mask = np.ones(seq_length, dtype=np.int64)
 
         return loss_mask
 
@@ -293,44 +499,116 @@ class GPTSFTDataset(Dataset):
             input_ids: A 1D tensor that holds the indices of tokens.
         """
         # seq_length = len(input_ids)
-        # `attention_mask` has the shape of [1, seq_length, seq_length]
-        attention_mask = torch.tril(torch.ones((max_length, max_length))).unsqueeze(0)
-        attention_mask = attention_mask < 0.5
-        return attention_mask
+        # `attention_mask` has the shape of [1, seq_length, seq_length]; True above the
+        # diagonal marks the masked positions. Allocate directly as bool instead of
+        # building a float mask and comparing it against 0.5.
+        attention_mask = ~torch.tril(torch.ones((max_length, max_length), dtype=torch.bool))
+        return attention_mask.unsqueeze(0)
+
+    def _pack_collate_fn(self, batch):
+        """Pack the examples of a batch into max_seq_length windows instead of padding.
+
+        Examples are binned whole with first-fit-decreasing. Within a window,
+        position ids restart at zero on each example boundary and the attention
+        mask only allows causal attention inside the same example, so the loss is
+        equivalent to the padded per-sample layout.
+        """
+        bins = []
+        bin_space = []
+        for item in sorted(batch, key=lambda item: len(item['input_ids']), reverse=True):
+            num_ids = len(item['input_ids'])
+            for i, space in enumerate(bin_space):
+                if num_ids <= space:
+                    bins[i].append(item)
+                    bin_space[i] -= num_ids
+                    break
+            else:
+                bins.append([item])
+                bin_space.append(self.max_seq_length - num_ids)
+
+        windows = []
+        for group in bins:
+            tokens, labels, loss_mask, position_ids, segment_ids = [], [], [], [], []
+            for seg, item in enumerate(group):
+                # shift within the example so labels never cross example boundaries
+                ids = item['input_ids']
+                tokens.extend(ids[:-1])
+                labels.extend(ids[1:])
+                loss_mask.extend(self._build_loss_mask(item)[1:])
+                position_ids.extend(range(len(ids) - 1))
+                segment_ids.extend([seg] * (len(ids) - 1))
+            windows.append((tokens, labels, loss_mask, position_ids, segment_ids))
+
+        if self.pad_to_max_length:
+            max_length = self.max_seq_length
+        else:
+            max_length = min(self.max_seq_length, (max(len(w[0]) for w in windows) + 7) & -8)
+
+        eos_id = self.tokenizer.eos_id
+        fused = np.empty((4, len(windows), max_length), dtype=np.int64)
+        self._collate_item([w[0] for w in windows], max_length=max_length, pad_id=eos_id, out=fused[0])
+        self._collate_item([w[1] for w in windows], max_length=max_length, pad_id=eos_id, out=fused[1])
+        self._collate_item([w[2] for w in windows], max_length=max_length, pad_id=0, out=fused[2])
+        self._collate_item([w[3] for w in windows], max_length=max_length, pad_id=0, out=fused[3])
+        tokens, labels, loss_mask, position_ids = torch.from_numpy(fused)
+
+        processed_batch = {
+            'tokens': tokens,
+            'labels': labels,
+            'loss_mask': loss_mask,
+            'position_ids': position_ids,
+            'metadata': [item['metadata'] for item in batch],
+        }
+
+        if self.emit_attention_mask:
+            # block-diagonal causal mask: padding (segment -1) attends to nothing
+            segment_ids = self._collate_item([w[4] for w in windows], max_length=max_length, pad_id=-1)
+            causal = np.tril(np.ones((max_length, max_length), dtype=bool))
+            allowed = (
+                causal[None] & (segment_ids[:, :, None] == segment_ids[:, None, :]) & (segment_ids[:, :, None] >= 0)
+            )
+            processed_batch['attention_mask'] = torch.from_numpy(~allowed).unsqueeze(1)
+
+        return processed_batch
 
     def collate_fn(self, batch):
+        if self.pack_sequences:
+            return self._pack_collate_fn(batch)
+
         input_ids = [item['input_ids'][:-1] for item in batch]
         labels = [item['input_ids'][1:] for item in batch]
         contexts = [item['context_ids'] for item in batch]
-        context_lengths = torch.LongTensor([item['context_length'] for item in batch])
+        context_lengths = torch.from_numpy(
+            np.fromiter((item['context_length'] for item in batch), dtype=np.int64, count=len(batch))
+        )
         answers = [item['answer_ids'] for item in batch]
         loss_mask = [self._build_loss_mask(item)[1:] for item in batch]
         metadata = [item['metadata'] for item in batch]
 
-        max_length = max(max([len(x) for x in input_ids]), max([len(x) for x in contexts]) + self.tokens_to_generate)
-        # increase max length to nearest multiple of 4 or 8
+        max_seq_length = self.max_seq_length
+        max_length = max(max(len(x) for x in input_ids), max(len(x) for x in contexts) + self.tokens_to_generate)
+        # increase max length to nearest multiple of 8; inlined as bit ops since 8 is a power of two
         if self.pad_to_max_length:
-            max_length = self.max_seq_length
+            max_length = max_seq_length
         else:
-            max_length = min(self.max_seq_length, self._ceil_to_nearest(max_length, 8))
-        assert max_length <= self.max_seq_length
-
-        attention_mask = [self._create_attention_mask(max_length) for _ in batch]
-        attention_mask = torch.stack(attention_mask)
-        position_ids = [list(range(max_length)) for _ in batch]
-        position_ids = torch.LongTensor(position_ids)
-        input_ids = torch.LongTensor(
-            self._collate_item(input_ids, max_length=max_length, pad_id=self.tokenizer.eos_id)
-        )
-        labels = torch.LongTensor(self._collate_item(labels, max_length=max_length, pad_id=self.tokenizer.eos_id))
-        loss_mask = torch.LongTensor(self._collate_item(loss_mask, max_length=max_length, pad_id=0))
-        contexts = torch.LongTensor(self._collate_item(contexts, max_length=max_length, pad_id=self.tokenizer.eos_id))
-        answers = torch.LongTensor(self._collate_item(answers, max_length=max_length, pad_id=self.tokenizer.eos_id))
+            max_length = min(max_seq_length, (max_length + 7) & -8)
+        assert max_length <= max_seq_length
+
+        position_ids = self._position_ids[:max_length].unsqueeze(0).expand(len(batch), -1)
+        # Collate the five [B, max_length] int64 fields into one contiguous buffer:
+        # a single allocation per batch, and the returned tensors are views into it.
+        fused = np.empty((5, len(batch), max_length), dtype=np.int64)
+        eos_id = self.tokenizer.eos_id
+        self._collate_item(input_ids, max_length=max_length, pad_id=eos_id, out=fused[0])
+        self._collate_item(labels, max_length=max_length, pad_id=eos_id, out=fused[1])
+        self._collate_item(loss_mask, max_length=max_length, pad_id=0, out=fused[2])
+        self._collate_item(contexts, max_length=max_length, pad_id=eos_id, out=fused[3])
+        self._collate_item(answers, max_length=max_length, pad_id=eos_id, out=fused[4])
+        input_ids, labels, loss_mask, contexts, answers = torch.from_numpy(fused)
 
         processed_batch = {
             'tokens': input_ids,
             'labels': labels,
-            'attention_mask': attention_mask,
             'loss_mask': loss_mask,
             'position_ids': position_ids,
             'contexts': contexts,
@@ -339,4 +617,11 @@ class GPTSFTDataset(Dataset):
             'metadata': metadata,
         }
 
+        if self.emit_attention_mask:
+            # The causal mask is the same for every sample, so build it once and
+            # expand (a view, no copy) across the batch instead of stacking B copies.
+            processed_batch['attention_mask'] = (
+                self._create_attention_mask(max_length).unsqueeze(0).expand(len(batch), -1, -1, -1)
+            )
+
         return processed_batch
@@ -22,6 +22,7 @@ from nemo.utils.decorators import experimental
 __all__ = [
     "MegatronPretrainingBatchSampler",
     "MegatronPretrainingRandomBatchSampler",
+    "MegatronLengthBucketBatchSampler",
 ]
 
 
@@ -169,6 +170,86 @@ class MegatronPretrainingBatchSampler(BaseMegatronBatchSampler):
             yield indices
 
 
+@experimental
+class MegatronLengthBucketBatchSampler(BaseMegatronBatchSampler):
+    """Batch sampler that groups samples of similar length to reduce padding.
+
+    Indices are ordered by the provided per-sample lengths (with random
+    tie-breaking), sliced into global batches of similar length, and the batch
+    order is shuffled every epoch so training does not follow a fixed length
+    curriculum. With `pad_to_max_length=False` collate functions, batches built
+    this way carry substantially fewer padding tokens than randomly mixed ones.
+
+    Only `drop_last=True` is supported: the sorted order is sliced into full
+    global batches and any tail samples are dropped every epoch.
+    """
+
+    def __init__(
+        self,
+        lengths,
+        total_samples: int,
+        consumed_samples: int,
+        micro_batch_size: int,
+        global_batch_size: int,
+        data_parallel_rank: int,
+        data_parallel_size: int,
+        drop_last: bool,
+        seed: int = 0,
+    ) -> None:
+        """Constructor of the length-bucketed Batch Sampler.
+
+        Args:
+            lengths: Per-sample lengths (tokens, or any monotone proxy such as
+                characters of the rendered text), one entry per dataset sample.
+            seed: Base seed of the per-epoch batch-order shuffle.
+
+        The remaining arguments match :class:`BaseMegatronBatchSampler`.
+        """
+        if not drop_last:
+            # __len__ would promise a final partial batch that __iter__ never yields:
+            # length-sorted indices are sliced into full global batches only.
+            raise RuntimeError("MegatronLengthBucketBatchSampler requires drop_last=True; the tail batch is dropped.")
+        super().__init__(
+            total_samples=total_samples,
+            consumed_samples=consumed_samples,
+            micro_batch_size=micro_batch_size,
+            global_batch_size=global_batch_size,
+            data_parallel_rank=data_parallel_rank,
+            data_parallel_size=data_parallel_size,
+            drop_last=drop_last,
+        )
+        if len(lengths) != total_samples:
+            raise RuntimeError(
+                "lengths must have one entry per sample: {} != {}".format(len(lengths), total_samples)
+            )
+        self.lengths = torch.as_tensor(lengths, dtype=torch.float)
+        self.seed = seed
+        self.last_batch_size = self.total_samples % self._global_batch_size
+
+    def __iter__(self):
+        active_total_samples = self.total_samples - self.last_batch_size
+        self.epoch = self.consumed_samples // active_total_samples
+        current_epoch_samples = self.consumed_samples % active_total_samples
+        assert current_epoch_samples % self._global_batch_size == 0
+
+        g = torch.Generator()
+        g.manual_seed(self.seed + self.epoch)
+        # sort by length with random sub-integer jitter as tie-breaker, then slice
+        # into global batches of similar length and shuffle the batch order
+        order = torch.argsort(self.lengths + torch.rand(self.total_samples, generator=g))
+        num_batches = active_total_samples // self._global_batch_size
+        batches = order[: num_batches * self._global_batch_size].view(num_batches, self._global_batch_size)
+        batch_order = torch.randperm(num_batches, generator=g)
+
+        consumed_batches = current_epoch_samples // self._global_batch_size
+        for batch_idx in batch_order[consumed_batches:].tolist():
+            batch = batches[batch_idx]
+            indices = batch[self.data_parallel_rank :: self.data_parallel_size].tolist()
+            assert len(indices) == self._global_batch_size_on_this_data_parallel_rank
+            self.consumed_samples += self._global_batch_size
+            yield indices
+
+
 @experimental
 class MegatronPretrainingRandomBatchSampler(BaseMegatronBatchSampler):
 
@@ -86,8 +86,12 @@ class RetroQAFineTuneDataset(Dataset):
                 name=file_path.split('/')[-1],
                 binary_head=False,
             )
+            # Keep just the dataset indices as a typed int64 array; __getitem__ then
+            # avoids destructuring a numpy row and the per-sample uint32 .item() call.
+            self._sample_idx_map = np.asarray(self.samples_mapping[:, 0], dtype=np.int64)
         else:
             self.samples_mapping = None
+            self._sample_idx_map = None
 
     def __len__(self):
         if self.max_num_samples is None:
@@ -96,14 +100,12 @@ class RetroQAFineTuneDataset(Dataset):
             return len(self.samples_mapping)
 
     def __getitem__(self, idx):
-        if isinstance(idx, np.int64):
-            idx = idx.item()
+        # int() normalizes both Python ints and the numpy scalars some samplers yield
+        idx = int(idx)
 
-        if self.samples_mapping is not None:
-            assert idx < len(self.samples_mapping)
-            idx, _, _ = self.samples_mapping[idx]
-            if isinstance(idx, np.uint32):
-                idx = idx.item()
+        if self._sample_idx_map is not None:
+            assert idx < len(self._sample_idx_map)
+            idx = int(self._sample_idx_map[idx])
 
         assert idx < len(self.indexed_dataset)
         example = self.indexed_dataset[idx]
@@ -173,8 +175,9 @@ class RetroQAFineTuneDataset(Dataset):
     def collate_fn(self, batch, tp_workers=0):
         """ Prepares input_ids, labels, loss mask, attention_mask, and position ids for global batch """
         input_ids, answer_starts, chunks = zip(*batch)
-        # convert chunks into torch tensors
-        chunks = torch.tensor(chunks)
+        # convert chunks into torch tensors; stacking the per-sample arrays and
+        # wrapping with from_numpy skips torch.tensor's recursive per-element copy
+        chunks = torch.from_numpy(np.stack(chunks))
 
         # Get max sequence length of batch
         batch_max = max(len(ids) for ids in input_ids)
@@ -210,27 +213,18 @@ class RetroQAFineTuneDataset(Dataset):
 
     def pad_batch_and_build_loss_mask(self, input_ids, batch_max, answer_starts):
         """ Pad input_ids in batch to max batch length while building loss mask """
-        batch_loss_masks = []
-        padded_input_ids = []
-        for ids, answer_start_idx in zip(input_ids, answer_starts):
+        # Pad and build the masks with numpy slice assignments instead of per-token
+        # Python floats; padding positions stay 0.0 in the mask by construction.
+        padded_input_ids = np.full((len(input_ids), batch_max), self.pad_token_id, dtype=np.int64)
+        batch_loss_masks = np.zeros((len(input_ids), batch_max), dtype=np.float32)
+        for i, (ids, answer_start_idx) in enumerate(zip(input_ids, answer_starts)):
+            padded_input_ids[i, : len(ids)] = ids
             if self.answer_only_loss and answer_start_idx is not None:
                 # Loss mask where answer tokens are 1.0 and all other tokens are 0.0
-                loss_mask = [float(idx >= answer_start_idx) for idx in range(len(ids))]
+                batch_loss_masks[i, answer_start_idx : len(ids)] = 1.0
             else:
                 # Loss mask where virtual tokens are 0.0 and all other tokens are 1.0
-                loss_mask = [1.0] * len(ids)
-            # Pad to max length
-            input_length = len(ids)
-            padding_length = batch_max - input_length
-            ids = ids + [self.pad_token_id] * padding_length
-            padded_input_ids.append(ids)
-
-            # Account for padding in loss mask
-            loss_mask.extend([0.0] * padding_length)
-            batch_loss_masks.append(torch.tensor(loss_mask, dtype=torch.float))
+                batch_loss_masks[i, : len(ids)] = 1.0
 
         # Make into torch tensors
-        padded_input_ids = torch.tensor(padded_input_ids, dtype=torch.long)
-        batch_loss_masks = torch.stack(batch_loss_masks)
-
-        return padded_input_ids, batch_loss_masks
+        return torch.from_numpy(padded_input_ids), torch.from_numpy(batch_loss_masks)
@@ -27,7 +27,16 @@ import torch
 from nemo.core import Dataset
 from nemo.utils import AppState, logging
 
-__all__ = ["TextMemMapDataset", "CSVMemMapDataset", "build_index_files"]
+try:
+    # orjson decodes typical SFT rows several times faster than stdlib json;
+    # fall back silently since the output dicts are identical.
+    import orjson
+
+    _json_loads = orjson.loads
+except (ImportError, ModuleNotFoundError):
+    _json_loads = json.loads
+
+__all__ = ["TextMemMapDataset", "CSVMemMapDataset", "ArrowMemMapDataset", "build_index_files", "build_arrow_file"]
 __idx_version__ = "0.2"  # index file version
 __idx_suffix__ = "idx"  # index file suffix
 
@@ -429,7 +438,7 @@ class JSONLMemMapDataset(TextMemMapDataset):
     def _build_data_from_text(self, text):
         """Return a dictionary of data based on a single JSON line."""
         try:
-            record = json.loads(text)
+            record = _json_loads(text)
         except Exception as e:
             logging.error(f"Exception: {e}")
             logging.error(f"datapoint: {text}")
@@ -437,6 +446,93 @@ class JSONLMemMapDataset(TextMemMapDataset):
         return record
 
 
+class ArrowMemMapDataset(Dataset):
+    """
+    Per-row access to Arrow IPC / Feather files via memory mapping.
+
+    Unlike JSONLMemMapDataset, rows are read as O(1) offset lookups into the
+    memory-mapped table without any per-row JSON parsing.
+    """
+
+    def __init__(self, dataset_paths: List[str], sort_dataset_paths: Optional[bool] = True):
+        """
+        Args:
+            dataset_paths: list of Arrow IPC (.arrow) or Feather (.feather) file paths.
+            sort_dataset_paths: whether to sort datasets by paths.
+        """
+        super().__init__()
+        import pyarrow as pa
+        from pyarrow import feather
+
+        # Make a single string into a list
+        if isinstance(dataset_paths, str):
+            dataset_paths = [dataset_paths]
+
+        if len(dataset_paths) < 1:
+            raise ValueError("files_list must contain at leat one file name")
+
+        self._files_list = dataset_paths
+        if sort_dataset_paths:
+            self._files_list = sorted(self._files_list)
+
+        self._load_tables()
+
+    def _load_tables(self):
+        import pyarrow as pa
+        from pyarrow import feather
+
+        logging.info(f"Loading {len(self._files_list)} Arrow files")
+        start_time = time.time()
+        tables = [feather.read_table(fn, memory_map=True) for fn in self._files_list]
+        self._table = tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+        logging.info(
+            f"Time loading {len(self._files_list)} Arrow files: {datetime.timedelta(seconds=time.time() - start_time)}"
+        )
+
+    def __getstate__(self):
+        # Pickle only the file paths (e.g. when spawning DataLoader workers); each
+        # process re-opens the memory map so all workers share the same physical
+        # pages through the OS page cache instead of copying the table.
+        state = self.__dict__.copy()
+        del state['_table']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._load_tables()
+
+    def __len__(self):
+        return self._table.num_rows
+
+    def __getitem__(self, idx):
+        """Return a dictionary of data for a single row."""
+        if (idx >= len(self)) or (idx < 0):
+            raise IndexError(f"Index {idx} if out of dataset range with {len(self)} samples")
+
+        return {name: column[idx].as_py() for name, column in zip(self._table.column_names, self._table.columns)}
+
+
+def build_arrow_file(jsonl_path: str, arrow_path: Optional[str] = None) -> str:
+    """
+    One-shot conversion of a JSONL file into an Arrow IPC file usable with ArrowMemMapDataset.
+
+    Returns the path of the Arrow file written (defaults to `<jsonl_path>.arrow`).
+    """
+    import pyarrow as pa
+    from pyarrow import json as pa_json
+
+    if arrow_path is None:
+        arrow_path = jsonl_path + ".arrow"
+
+    logging.info(f"Converting {jsonl_path} to {arrow_path}")
+    table = pa_json.read_json(jsonl_path)
+    with pa.OSFile(arrow_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    return arrow_path
+
+
 def _index_file_exists(idx_fn):
     """Helper function to test if index file exists"""
     if os.path.exists(idx_fn + ".npy") and os.path.exists(idx_fn + ".info"):
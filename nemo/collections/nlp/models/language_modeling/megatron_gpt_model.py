@@ -824,14 +824,16 @@ class MegatronGPTModel(MegatronBaseModel, TextGeneration):
                 if parallel_state.is_pipeline_last_stage():
                     required_keys.update(('labels', 'loss_mask'))
             if self.get_attention_mask_from_fusion:
-                required_keys.remove('attention_mask')
+                required_keys.discard('attention_mask')
             batch = {key: val.cuda(non_blocking=True) if key in required_keys else None for key, val in batch.items()}
 
             # Model forward pass
+            # attention_mask may be absent when the dataset skips emitting it
+            # (e.g. GPTSFTDataset with emit_attention_mask=False)
             forward_args = {
                 'input_ids': batch['tokens'],
                 'position_ids': batch['position_ids'],
-                'attention_mask': batch['attention_mask'],
+                'attention_mask': batch.get('attention_mask'),
                 'labels': batch['labels'],
                 'loss_mask': batch['loss_mask'],
             }
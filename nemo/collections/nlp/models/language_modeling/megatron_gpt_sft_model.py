@@ -28,6 +28,7 @@ from nemo.collections.nlp.data.language_modeling.megatron.blendable_dataset impo
 from nemo.collections.nlp.data.language_modeling.megatron.gpt_sft_chat_dataset import GPTSFTChatDataset
 from nemo.collections.nlp.data.language_modeling.megatron.gpt_sft_dataset import GPTSFTDataset
 from nemo.collections.nlp.data.language_modeling.megatron.megatron_batch_samplers import (
+    MegatronLengthBucketBatchSampler,
     MegatronPretrainingBatchSampler,
 )
 from nemo.collections.nlp.models.language_modeling.megatron_gpt_model import MegatronGPTModel
@@ -216,6 +217,24 @@ class MegatronGPTSFTModel(MegatronGPTModel):
         if not is_list_config:
             raise ValueError(f"SFT train/validation datasets must be provided as a list of individual JSONL files.")
 
+        if is_train and data_cfg.get('pack_sequences', False):
+            # The packed collate emits a data-dependent number of windows as the batch
+            # dimension, which get_iterator_k_split cannot split into fixed-size micro
+            # batches and pipeline schedules cannot reconcile with the declared micro
+            # batch size. Only single-microbatch, non-pipeline runs are supported.
+            if data_cfg.global_batch_size != data_cfg.micro_batch_size * parallel_state.get_data_parallel_world_size():
+                raise ValueError(
+                    f"pack_sequences requires global_batch_size ({data_cfg.global_batch_size}) == "
+                    f"micro_batch_size ({data_cfg.micro_batch_size}) x data parallel size "
+                    f"({parallel_state.get_data_parallel_world_size()}), i.e. a single micro batch, "
+                    f"because packing produces a variable number of sequences per batch."
+                )
+            if parallel_state.get_pipeline_model_parallel_world_size() > 1:
+                raise ValueError("pack_sequences is not supported with pipeline model parallelism.")
+            if self.cfg.data.get("chat", False):
+                # The chat collate path never packs, so the flag would silently do nothing.
+                raise ValueError("pack_sequences is not supported with chat datasets.")
+
         if is_train:
             # Construct the data prefix list for `get_datasets_weights_and_num_samples()`
             # that is of the format [weight1,file_name1,weight2,file_name2,...]
@@ -295,9 +314,23 @@ class MegatronGPTSFTModel(MegatronGPTModel):
                 memmap_workers=data_cfg.get(
                     'memmap_workers', None
                 ),  # used to set num. of workers to create the memmap index files
+                metadata_keys=data_cfg.get(
+                    'metadata_keys', None
+                ),  # used to restrict pass-through metadata (and column reads) to the listed keys
                 hf_dataset=data_cfg.get(
                     'hf_dataset', False
                 ),  # Whether to load the json file with the HuggingFace dataset. otherwise, will load the jsonl file with the JSONLMemMapDataset.
+                pack_sequences=is_train
+                and data_cfg.get(
+                    'pack_sequences', False
+                ),  # Pack multiple training examples per sequence instead of padding.
+                emit_attention_mask=data_cfg.get(
+                    'emit_attention_mask', not self.get_attention_mask_from_fusion
+                ),  # The fused-mask forward ignores the collated mask, so skip building it by default in that case.
+                use_tokenized_index=is_train
+                and data_cfg.get(
+                    'use_tokenized_index', False
+                ),  # Serve ids from a prebuilt tokenized index; training only, since it carries no metadata.
             )
             datasets.append(dataset)
 
@@ -775,22 +808,44 @@ class MegatronGPTSFTModel(MegatronGPTModel):
         else:
             collate_fn = dataset.collate_fn
 
-        batch_sampler = MegatronPretrainingBatchSampler(
-            total_samples=len(dataset),
-            consumed_samples=consumed_samples,
-            micro_batch_size=data_cfg.micro_batch_size,
-            global_batch_size=data_cfg.global_batch_size,
-            data_parallel_rank=parallel_state.get_data_parallel_rank(),
-            data_parallel_size=parallel_state.get_data_parallel_world_size(),
-            drop_last=data_cfg.drop_last,
-            pad_samples_to_global_batch_size=not data_cfg.drop_last,
-        )
+        if data_cfg.get('length_bucketing', False):
+            # Group samples of similar length into the same global batch so the
+            # dynamically padded collate wastes fewer tokens. Requires drop_last=True.
+            batch_sampler = MegatronLengthBucketBatchSampler(
+                lengths=dataset.sample_lengths(),
+                total_samples=len(dataset),
+                consumed_samples=consumed_samples,
+                micro_batch_size=data_cfg.micro_batch_size,
+                global_batch_size=data_cfg.global_batch_size,
+                data_parallel_rank=parallel_state.get_data_parallel_rank(),
+                data_parallel_size=parallel_state.get_data_parallel_world_size(),
+                drop_last=data_cfg.drop_last,
+                seed=data_cfg.get('seed', 1234),
+            )
+        else:
+            batch_sampler = MegatronPretrainingBatchSampler(
+                total_samples=len(dataset),
+                consumed_samples=consumed_samples,
+                micro_batch_size=data_cfg.micro_batch_size,
+                global_batch_size=data_cfg.global_batch_size,
+                data_parallel_rank=parallel_state.get_data_parallel_rank(),
+                data_parallel_size=parallel_state.get_data_parallel_world_size(),
+                drop_last=data_cfg.drop_last,
+                pad_samples_to_global_batch_size=not data_cfg.drop_last,
+            )
+        # Keep workers alive between epochs and queue extra collated batches so the
+        # pinned H2D copies overlap with compute instead of stalling each step.
+        worker_kwargs = {}
+        if data_cfg.num_workers > 0:
+            worker_kwargs['persistent_workers'] = True
+            worker_kwargs['prefetch_factor'] = data_cfg.get('prefetch_factor', 2)
         return torch.utils.data.DataLoader(
             dataset,
             batch_sampler=batch_sampler,
             collate_fn=collate_fn,
             num_workers=data_cfg.num_workers,
             pin_memory=data_cfg.pin_memory,
+            **worker_kwargs,
         )
 
     def setup_training_dataloader(self):
@@ -16,6 +16,8 @@ import json
 import threading
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 headers = {"Content-Type": "application/json"}
 
@@ -23,14 +25,24 @@ lock = threading.Lock()
 
 __all__ = ["request_data", "lock"]
 
+# Shared session with keep-alive: the retrieval/generation services are hit once
+# or more per query, so reusing pooled connections avoids paying a TCP handshake
+# on every call. Retries are limited to the connect phase — the PUTs here are not
+# idempotent (a /generate call that failed after being sent may already have run),
+# so requests that reached the server are never re-issued.
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(connect=3, read=0))
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
+
 
 def request_data(data, ip='localhost', port=None):
-    resp = requests.put(f'http://{ip}:{port}/knn', data=json.dumps(data), headers=headers)
+    resp = _session.put(f'http://{ip}:{port}/knn', data=json.dumps(data), headers=headers)
     return resp.json()
 
 
 def text_generation(data, ip='localhost', port=None):
-    resp = requests.put(f'http://{ip}:{port}/generate', data=json.dumps(data), headers=headers)
+    resp = _session.put(f'http://{ip}:{port}/generate', data=json.dumps(data), headers=headers)
     return resp.json()
 
 
@@ -388,6 +388,8 @@ class RetroDemoWebApp:
         self.text_service_port = text_service_port
         self.combo_service_ip = combo_service_ip
         self.combo_service_port = combo_service_port
+        # used to skip the combo-service weight update when the slider has not moved
+        self._last_weight = None
 
     def get_retro_generation(
         self,
@@ -418,7 +420,12 @@ class RetroDemoWebApp:
             "neighbors": int(neighbors),
             "end_strings": [i.strip() for i in end_strings.split(',') if len(i) != 0],
         }
-        self.update_weight(weight)
+        # The text service retrieves through the combo service while generating, so a
+        # changed weight must land before generation starts; only an unchanged weight
+        # lets us skip the round trip.
+        if weight != self._last_weight:
+            self.update_weight(weight)
+            self._last_weight = weight
         output_json = text_generation(data, self.text_service_ip, self.text_service_port)
         sentences = output_json['sentences']
         retrieved = output_json['retrieved']
@@ -15,6 +15,7 @@
 import csv
 import json
 import os
+import pickle
 
 import pytest
 
@@ -66,6 +67,14 @@ def csv_file(tmp_path):
     file_path.unlink()
 
 
+@pytest.fixture
+def arrow_file(tmp_path, jsonl_file):
+    pytest.importorskip("pyarrow")
+
+    # Convert the JSONL fixture to an Arrow IPC file
+    yield text_memmap_dataset.build_arrow_file(jsonl_file, str(tmp_path / "data.arrow"))
+
+
 def test_jsonl_mem_map_dataset(jsonl_file):
     """Test for JSONL memory-mapped datasets."""
 
@@ -75,6 +84,35 @@ def test_jsonl_mem_map_dataset(jsonl_file):
     assert indexed_dataset[2] == {"name": "Bob", "age": 35}
 
 
+def test_arrow_mem_map_dataset(arrow_file):
+    """Test for Arrow memory-mapped datasets built from a JSONL file."""
+
+    indexed_dataset = text_memmap_dataset.ArrowMemMapDataset(dataset_paths=[arrow_file])
+    assert len(indexed_dataset) == 3
+    assert indexed_dataset[0] == {"name": "John", "age": 30}
+    assert indexed_dataset[1] == {"name": "Jane", "age": 25}
+    assert indexed_dataset[2] == {"name": "Bob", "age": 35}
+
+
+def test_arrow_mem_map_dataset_index_errors(arrow_file):
+    """Out-of-range row access should raise IndexError rather than return arbitrary data."""
+
+    indexed_dataset = text_memmap_dataset.ArrowMemMapDataset(dataset_paths=[arrow_file])
+    with pytest.raises(IndexError):
+        indexed_dataset[len(indexed_dataset)]
+    with pytest.raises(IndexError):
+        indexed_dataset[-1]
+
+
+def test_arrow_mem_map_dataset_pickling(arrow_file):
+    """DataLoader workers pickle the dataset by path and re-open the memory map on unpickling."""
+
+    indexed_dataset = text_memmap_dataset.ArrowMemMapDataset(dataset_paths=[arrow_file])
+    restored_dataset = pickle.loads(pickle.dumps(indexed_dataset))
+    assert len(restored_dataset) == len(indexed_dataset)
+    assert restored_dataset[1] == indexed_dataset[1]
+
+
 def test_csv_mem_map_dataset(csv_file):
     """Test for CSV memory-mapped datasets."""
 